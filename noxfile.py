@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-import importlib.util
+import hashlib
 import logging
 import os
 from pathlib import Path
@@ -12,10 +12,8 @@ import typing as t
 import nox
 
 ## Set nox options
-if importlib.util.find_spec("uv"):
-    nox.options.default_venv_backend = "uv|virtualenv"
-else:
-    nox.options.default_venv_backend = "virtualenv"
+## uv is required, session.install() runs 'uv pip install' with this backend
+nox.options.default_venv_backend = "uv"
 nox.options.reuse_existing_virtualenvs = True
 nox.options.error_on_external_run = False
 nox.options.error_on_missing_interpreters = False
@@ -44,13 +42,40 @@ VENV_DIR = Path("./.venv").resolve()
 
 LINT_PATHS: list[str] = ["src", "tests"]
 
+## Files that decide which dependencies get installed in a session
+DEPENDENCY_FILES: list[Path] = [Path("uv.lock"), Path("pyproject.toml")]
+## File in each session's virtualenv recording the hash of DEPENDENCY_FILES at last sync
+INSTALL_HASH_FILENAME: str = ".pingpy_install_hash"
+
+
+def dependency_files_hash() -> str:
+    """Return a sha256 hex digest of the files in DEPENDENCY_FILES."""
+    digest = hashlib.sha256()
+
+    for f in DEPENDENCY_FILES:
+        if f.exists():
+            digest.update(f.read_bytes())
+
+    return digest.hexdigest()
+
 
 def install_uv_project(session: nox.Session, external: bool = False) -> None:
-    """Method to install uv and the current project in a nox session."""
-    log.info("Installing uv in session")
-    session.install("uv")
-    log.info("Syncing uv project")
-    session.run("uv", "sync", external=external)
+    """Method to install the current project in a nox session with uv.
+
+    Dependencies are only synced when uv.lock or pyproject.toml changed since the
+    session's virtualenv was last synced. The project itself is always reinstalled
+    so sessions test the current source.
+    """
+    install_hash_file: Path = Path(session.virtualenv.location) / INSTALL_HASH_FILENAME
+    deps_hash: str = dependency_files_hash()
+
+    if install_hash_file.exists() and install_hash_file.read_text() == deps_hash:
+        log.info("Dependencies unchanged since last sync, skipping uv sync")
+    else:
+        log.info("Syncing uv project")
+        session.run("uv", "sync", external=external)
+        install_hash_file.write_text(deps_hash)
+
     log.info("Installing project")
     session.run("uv", "pip", "install", ".", external=external)
 
@@ -132,29 +157,32 @@ Double check imports in _init_.py files, ruff removes unused imports by default.
     session.install("ruff")
 
     log.info("Linting code")
+    existing_paths: list[str] = []
     for d in lint_paths:
         if not Path(d).exists():
             log.warning(f"Skipping lint path '{d}', could not find path")
-            pass
         else:
-            lint_path: Path = Path(d)
-            log.info(f"Running ruff imports sort on '{d}'")
-            session.run(
-                "ruff",
-                "check",
-                lint_path,
-                "--select",
-                "I",
-                "--fix",
-            )
-
-            log.info(f"Running ruff checks on '{d}' with --fix")
-            session.run(
-                "ruff",
-                "check",
-                lint_path,
-                "--fix",
-            )
+            existing_paths.append(d)
+
+    if existing_paths:
+        ## Lint all paths in one ruff call so ruff can parallelize across every file
+        log.info(f"Running ruff imports sort on {existing_paths}")
+        session.run(
+            "ruff",
+            "check",
+            *existing_paths,
+            "--select",
+            "I",
+            "--fix",
+        )
+
+        log.info(f"Running ruff checks on {existing_paths} with --fix")
+        session.run(
+            "ruff",
+            "check",
+            *existing_paths,
+            "--fix",
+        )
 
     log.info("Linting noxfile.py")
     session.run(
@@ -187,8 +215,6 @@ def export_requirements(session: nox.Session, requirements_output_dir: Path):
 
             requirements_output_dir: Path = Path("./")
 
-    session.install(f"uv")
-
     log.info("Exporting production requirements")
     session.run(
         "uv",
@@ -212,6 +238,12 @@ def run_tests(session: nox.Session):
         "pytest",
         "-n",
         "auto",
+        ## Keep each test file on one worker so its fixtures are set up once
+        "--dist=loadfile",
+        ## Skip writing .pytest_cache and sys.path insertion during collection
+        "-p",
+        "no:cacheprovider",
+        "--import-mode=importlib",
         "--tb=auto",
         "-v",
         "-rsXxfP",
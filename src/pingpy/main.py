@@ -1,75 +1,124 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass, field
+import asyncio
+import contextlib
+from functools import cache
 import logging
-from pathlib import Path
+import os
 import platform
-import re
-import subprocess
+import socket
 import sys
-from time import sleep
+
+try:
+    ## Optional: send ICMP echo requests in-process instead of running `ping`
+    import icmplib
+except ImportError:
+    icmplib = None
 
 ## Initialize logging
 log = logging.getLogger("pingpy")
-console_handler = logging.StreamHandler()
 
-@dataclass
-class PingArgs:
-    """Dataclass for CLI args.
-    
+## Log formatters, built once and shared by every set_logging_format() call
+_FMT_DEBUG = logging.Formatter(
+    "%(asctime)s > [%(levelname)s] > %(module)s.%(funcName)s:%(lineno)s > %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+_FMT_VERBOSE = logging.Formatter(
+    "%(asctime)s > [%(levelname)s] > %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+_FMT_PLAIN = logging.Formatter(
+    "%(asctime)s > %(message)s",
+    datefmt="%H:%M:%S"
+)
+_FMT_FILE = logging.Formatter(
+    "%(asctime)s | [%(levelname)s] | %(message)s",
+    datefmt="%H:%M:%S"
+)
+
+## Seconds to wait for a reply before a ping counts as a failure
+PING_TIMEOUT_SECONDS: int = 1
+
+## Detect the platform once, the ping args do not change between pings
+_IS_WINDOWS: bool = platform.system().lower() == "windows"
+
+def _platform_ping_argv(is_windows, platform_name):
+    """Returns the ping args for a single request on a platform, the target is appended last.
+
+    Description:
+        The reply timeout flag is left off on platforms whose `ping -W` units are not
+        known, the `wait_for` timeout around each ping still stops a hung request.
+
     Params:
-        target (str): Target IP address or hostname to ping.
-        count (int): Number of times to ping the target. Default is 1.
-        verbose (bool): Whether to print verbose output. Default is False.
-        debug (bool): Whether to enable debug logging. Default is False.
-        file (str): Path to the log file. Default is None.
-        overwrite (bool): Whether to overwrite the log file if it exists. Default is False.
-        append (bool): Whether to append to the log file if it exists. Default is False.
-        sleep (int): Number of seconds to wait between pings. Default is 1.
+        is_windows (bool): Whether the platform is Windows.
+        platform_name (str): The platform's `sys.platform` value.
+
+    Returns:
+        (list[str]): The `ping` command line without the target.
+
     """
+    if is_windows:
+        ## Windows takes the reply timeout in milliseconds
+        return ["ping", "-n", "1", "-w", str(PING_TIMEOUT_SECONDS * 1000)]
+    if platform_name.startswith("linux"):
+        ## Linux takes the reply timeout in seconds
+        return ["ping", "-c", "1", "-W", str(PING_TIMEOUT_SECONDS)]
+    if platform_name == "darwin" or platform_name.startswith("freebsd"):
+        ## macOS and FreeBSD take the reply timeout in milliseconds
+        return ["ping", "-c", "1", "-W", str(PING_TIMEOUT_SECONDS * 1000)]
 
-    target: str = field(default=None)
-    count: int = field(default=1)
-    verbose: bool = field(default=False)
-    debug: bool = field(default=False)
-    file: str | None = field(default=None)
-    overwrite: bool = field(default=False)
-    append: bool = field(default=False)
-    sleep: int = field(default=1)
+    return ["ping", "-c", "1"]
 
+## Ping args for a single request, built once for every ping
+_PING_ARGV: list[str] = _platform_ping_argv(_IS_WINDOWS, sys.platform)
+
+## Cap on the number of pings allowed to run at once
+MAX_CONCURRENT_PINGS: int = (os.cpu_count() or 1) * 4
+
+## Cleared the first time icmplib cannot open an unprivileged ICMP socket,
+## later pings go straight to the `ping` command instead of failing again
+_icmp_sockets_allowed: bool = True
+
+@cache
+def get_console_handler():
+    """Returns the pingpy console handler, creating it on first use.
+
+    Description:
+        Created lazily so importing pingpy as a library does not build a handler it never uses.
+    """
+    return logging.StreamHandler()
 
 def set_logging_format(args):
-    """Setup logging based on args passed to CLI."""
-    formatter = None
-    
+    """Setup logging based on args passed to CLI.
+
+    Description:
+        Safe to call more than once, the console handler is only attached to the
+        logger the first time.
+    """
     ## -d/--debug arg
     if args.debug:
         log.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            "%(asctime)s > [%(levelname)s] > %(module)s.%(funcName)s:%(lineno)s > %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
+        formatter = _FMT_DEBUG
     ## -v/--verbose arg
     elif args.verbose:
         log.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            "%(asctime)s > [%(levelname)s] > %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
+        formatter = _FMT_VERBOSE
     ## Standard logging
     else:
         log.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            "%(asctime)s > %(message)s",
-            datefmt="%H:%M:%S"
-        )
+        formatter = _FMT_PLAIN
 
+    console_handler = get_console_handler()
     console_handler.setFormatter(formatter)
-    log.addHandler(console_handler)
+    if console_handler not in log.handlers:
+        log.addHandler(console_handler)
 
     ## Set up file logging if a file path is provided
     if args.file:
+        ## Only needed when logging to a file, keep it off the CLI's startup path
+        from pathlib import Path
+
         file_path = Path(args.file)
         
         if file_path.exists() and not (args.append or args.overwrite):
@@ -87,11 +136,7 @@ def set_logging_format(args):
         ## File mode based on append/overwrite
         file_mode = 'a' if args.append else 'w'
         file_handler = logging.FileHandler(file_path, mode=file_mode)
-        file_formatter = logging.Formatter(
-            "%(asctime)s | [%(levelname)s] | %(message)s",
-            datefmt="%H:%M:%S"
-        )
-        file_handler.setFormatter(file_formatter)
+        file_handler.setFormatter(_FMT_FILE)
         file_handler.setLevel("INFO")
         
         log.addHandler(file_handler)
@@ -120,37 +165,205 @@ def parse_args():
     return parser.parse_args()
 
 
-def _parse_ping_response(output):
-    """Parses the output of the ping command to extract the IP address, time, TTL, and success status."""
-    # Pattern for Windows format (including 'time<1ms' case)
-    windows_pattern = r"Reply from ([\d\.]+): bytes=\d+ time=(\d+ms|<1ms) TTL=(\d+)"
-    # Pattern for Linux/macOS format
-    unix_pattern = r"(\d+) bytes from ([\d\.]+): icmp_seq=\d+ ttl=(\d+) time=(\d+\.\d+) ms"
-    
-    # Try to match the output against the patterns
-    match = re.search(windows_pattern, output)
-    if match:
-        ip_address = match.group(1)
-        time = match.group(2)  # time can be in "ms" or "<1ms"
-        ttl = match.group(3)
-        success = True
+def _resolve_target(target):
+    """Resolves a hostname to an IP address once, so `ping` does not look it up on every run.
+
+    Description:
+        Only IPv4 addresses are looked up, macOS `ping` does not accept IPv6 targets.
+
+    Params:
+        target (str): Target IP address or hostname to ping.
+
+    Returns:
+        (str): The target's first resolved IPv4 address, or `target` itself if it cannot be resolved.
+
+    """
+    try:
+        return socket.getaddrinfo(target, None, family=socket.AF_INET, type=socket.SOCK_DGRAM)[0][4][0]
+    except (socket.gaierror, UnicodeError) as exc:
+        log.debug("Unable to resolve %s, pinging it by name. Details: %s", target, exc)
+        return target
+
+async def _icmp_ping_once(target):
+    """Sends a single ICMP echo request to a target with icmplib.
+
+    Params:
+        target (str): Target IP address or hostname to ping.
+
+    Returns:
+        (tuple[bool, float | None] | None): Whether the target replied, and the round trip
+            time in milliseconds if it did. None if unprivileged ICMP sockets are not
+            available and the `ping` command should be used instead.
+
+    """
+    global _icmp_sockets_allowed
+
+    try:
+        host = await icmplib.async_ping(target, count=1, timeout=PING_TIMEOUT_SECONDS, privileged=False)
+    except icmplib.SocketPermissionError as exc:
+        log.debug("Unable to open an ICMP socket, falling back to the ping command. Details: %s", exc)
+        _icmp_sockets_allowed = False
+        return None
+    except icmplib.ICMPLibError as exc:
+        log.debug("(%s) Error pinging %s. Details: %s", type(exc), target, exc)
+        return False, None
+
+    return host.is_alive, host.avg_rtt if host.is_alive else None
+
+def _reply_rtt(line):
+    """Returns the round trip time in milliseconds from a `ping` reply line, or None if it has none.
+
+    Description:
+        Handles the Windows ("time=1ms", "time<1ms") and Linux/macOS ("time=0.045 ms") formats.
+        A Windows "time<1ms" reply is counted as 0.5 ms.
+    """
+    ## Match the full "time=" field, a hostname like time.cloudflare.com can contain "time"
+    i = line.find(b"time=")
+    if i == -1:
+        return 0.5 if b"time<1ms" in line else None
+
+    ## Skip past "time="
+    start = end = i + 5
+    while end < len(line) and (line[end:end + 1].isdigit() or line[end:end + 1] == b"."):
+        end += 1
+
+    try:
+        return float(line[start:end])
+    except ValueError:
+        return None
+
+async def _read_until_reply(stdout):
+    """Reads `ping` output line by line, stopping at the first reply.
+
+    Params:
+        stdout (asyncio.StreamReader): The `ping` process's stdout.
+
+    Returns:
+        (tuple[bool, float | None]): Whether a reply line was read before the output ended,
+            and the round trip time in milliseconds from that line.
+
+    """
+    async for line in stdout:
+        ## The reply sentinels are ASCII, check the raw bytes without decoding
+        if b"TTL=" in line or b"time=" in line:
+            return True, _reply_rtt(line)
+
+    return False, None
+
+async def _subprocess_ping_once(argv):
+    """Runs the platform's `ping` command once without blocking the event loop.
+
+    Params:
+        argv (list[str]): Full `ping` command line, including the target.
+
+    Returns:
+        (tuple[bool, float | None]): Whether the target replied, and the round trip time
+            in milliseconds if it did.
+
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+
+    try:
+        ## Give the child a second of grace past its own reply timeout
+        return await asyncio.wait_for(_read_until_reply(proc.stdout), timeout=PING_TIMEOUT_SECONDS + 1)
+    except TimeoutError:
+        return False, None
+    finally:
+        ## Always reap the child, including when CTRL+C cancels the ping mid-read
+        if proc.returncode is None:
+            ## Stop ping once the reply is seen (its summary is not needed) or if it hung
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+        await proc.wait()
+
+async def _ping_once(target, address, argv):
+    """Pings a target once, with icmplib if it is installed or the `ping` command otherwise.
+
+    Params:
+        target (str): Target IP address or hostname, used in log messages.
+        address (str): Resolved address of the target to send the ping to.
+        argv (list[str]): Full `ping` command line to fall back to if icmplib cannot be used.
+
+    Returns:
+        (tuple[bool, float | None]): Whether the target replied, and the round trip time
+            in milliseconds if it did.
+
+    """
+    result = None
+
+    if icmplib is not None and _icmp_sockets_allowed:
+        result = await _icmp_ping_once(address)
+
+    if result is None:
+        result = await _subprocess_ping_once(argv)
+
+    if result[0]:
+        ## Ping success
+        log.info("Reply from %s - Success", target)
     else:
-        match = re.search(unix_pattern, output)
-        if match:
-            ip_address = match.group(2)
-            time = match.group(4)
-            ttl = match.group(3)
-            success = True
-        else:
-            ip_address = None
-            time = None
-            ttl = None
-            success = False
-
-    return ip_address, success, time, ttl
+        ## Ping failure
+        log.warning("No reply from %s - Failure", target)
+
+    return result
+
+async def _ping_in_slot(target, address, argv, seq, repeat, semaphore, results):
+    """Pings the target once, then frees the concurrency slot `_ping_many` acquired for it.
+
+    Description:
+        The ping's result is appended to `results` as soon as it completes.
+    """
+    try:
+        log.debug("Ping [%d/%d]", seq + 1, repeat)
+        results.append(await _ping_once(target, address, argv))
+    finally:
+        semaphore.release()
+
+async def _ping_many(target, address, repeat, sleep_seconds, results):
+    """Launches pings concurrently, starting one every `sleep_seconds`.
+
+    Description:
+        A concurrency slot is taken before each ping is launched, so at most
+        MAX_CONCURRENT_PINGS ping tasks exist at once however large `repeat` is. Each
+        ping appends its result to `results` as soon as it completes, so partial
+        counts survive an interrupted run.
+
+    Params:
+        target (str): Target IP address or hostname, used in log messages.
+        address (str): Resolved address of the target to send pings to.
+        repeat (int): Number of times to ping the target. 0 or less=infinite.
+        sleep_seconds (int): Number of seconds between the start of each ping.
+        results (list[tuple[bool, float | None]]): List to collect the (success, round trip
+            time) result of each ping in.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PINGS)
+    ## Build the ping command line once for every ping in the run
+    argv = [*_PING_ARGV, address]
+    seq = 0
+
+    try:
+        async with asyncio.TaskGroup() as pings:
+            while repeat <= 0 or seq < repeat:
+                ## Wait for a free slot, _ping_in_slot releases it when its ping is done
+                await semaphore.acquire()
+                pings.create_task(_ping_in_slot(target, address, argv, seq, repeat, semaphore, results))
+                seq += 1
+
+                if repeat <= 0 or seq < repeat:
+                    await asyncio.sleep(sleep_seconds)
+    except ExceptionGroup as group:
+        ## Surface the first failed ping's error, like gather() did
+        raise group.exceptions[0] from None
 
 def _ping_target(target, repeat=3, sleep_seconds=1,verbose=False):
     """Pings a target IP address or hostname a specified number of times and logs the results.
+
+    Description:
+        Pings are run concurrently, each one starting `sleep_seconds` after
+        the previous, so a slow reply does not delay the pings after it.
     
     Params:
         target (str): Target IP address or hostname to ping.
@@ -158,59 +371,30 @@ def _ping_target(target, repeat=3, sleep_seconds=1,verbose=False):
         sleep_seconds (int): Number of seconds to wait between pings. Default is 1 second.
         verbose (bool): Whether to print verbose output. Default is False.
     """
-    ## Initialize counts
-    successes = 0
-    failures = 0
+    ## Collect the (success, round trip time) result of each ping
+    results: list[tuple[bool, float | None]] = []
     
-    log.info(f"Pinging {target} [repeat: {'indefinitely' if repeat == 0 else str(repeat) +  ' time(s)'}]")
+    log.info(f"Pinging {target} [repeat: {'indefinitely' if repeat <= 0 else str(repeat) +  ' time(s)'}]")
 
     try:
-        for i in range(repeat if repeat > 0 else sys.maxsize):
-            log.debug(f"Ping [{i + 1}/{repeat}]")
-
-            if platform.system().lower() == 'windows':
-                ## Run the ping command for Windows
-                try:
-                    result = subprocess.run(
-                        ["ping", target, "-n", "1"],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True
-                    )
-                except subprocess.CalledProcessError as e:
-                    log.error(f"Error running ping command: {e}")
-                    sys.exit(1)
-
-            else:
-                ## Run the ping command for Unix-based systems
-                try:
-                    result = subprocess.run(
-                        ["ping", "-c", "1", target],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True
-                    )
-                except subprocess.CalledProcessError as e:
-                    log.error(f"Error running ping command: {e}")
-                    sys.exit(1)
-
-            if "TTL=" in result.stdout or "time=" in result.stdout:
-                ## Ping success
-                successes += 1
-                log.info(f"Reply from {target} - Success")
-            else:
-                ## Ping failure
-                failures += 1
-                log.warning(f"No reply from {target} - Failure")
-
-            ## Optional: Add a delay between pings
-            sleep(sleep_seconds)
+        ## Look a hostname up once for the whole run, a single ping leaves that to `ping`
+        address = _resolve_target(target) if repeat != 1 else target
+
+        asyncio.run(_ping_many(target, address, repeat, sleep_seconds, results))
 
     except KeyboardInterrupt:
         log.info("Ping interrupted by user (CTRL+C).")
 
     finally:
-        log.info(f"Ping {target} complete. Successes: {successes}, Failures: {failures}")
+        successes = sum(success for success, _ in results)
+        failures = len(results) - successes
+        rtts = [rtt for _, rtt in results if rtt is not None]
+
+        summary = f"Ping {target} complete. Successes: {successes}, Failures: {failures}"
+        if rtts:
+            summary += f", Average RTT: {sum(rtts) / len(rtts):.2f} ms"
+
+        log.info(summary)
 
 def ping():
     """Pingpy entrypoint.
@@ -220,23 +404,26 @@ def ping():
     """
     ## Parse CLI arguments    
     args = parse_args()
+    ## Log records never use thread or process info, skip looking it up per record.
+    ## Set here rather than at import so pingpy does not change logging for a host app.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     ## Initialize pingpy logging
     set_logging_format(args)
     
-    ## Initialize PingArgs class
-    ping_settings: PingArgs = PingArgs(**vars(args))
-    log.debug(f"Ping settings: {ping_settings}")
+    log.debug("Ping settings: %s", args)
     
-    if ping_settings.debug:
+    if args.debug:
         log.debug("Debug mode enabled")
-    elif ping_settings.verbose:
+    elif args.verbose:
         log.debug("Verbose mode enabled")
 
     ## Start ping
     try:
-        _ping_target(ping_settings.target, ping_settings.count, ping_settings.sleep, ping_settings.verbose)
+        _ping_target(args.target, args.count, args.sleep, args.verbose)
     except Exception as exc:
-        msg = f"An error occurred while pinging {ping_settings.target}. Details: {exc}"
+        msg = f"An error occurred while pinging {args.target}. Details: {exc}"
         log.error(msg)
         sys.exit(1)
 
@@ -3,3 +3,19 @@ from __future__ import annotations
 import pytest
 
 pytest_plugins = ["tests.fixtures.python_fixtures.fixtures"]
+
+def pytest_collection_modifyitems(items):
+    """Mark every test in a module that uses the pyfakefs sandbox with `fakefs`.
+
+    Description:
+        The sandbox_fs Patcher is module-scoped and pyfakefs resumes it for the rest of the
+        module, so tests that do not request it run on the fake filesystem too.
+        Run `pytest -m "not fakefs"` to skip all tests that pay for pyfakefs patching.
+    """
+    fakefs_modules = {
+        item.module for item in items if "sandbox_fs" in getattr(item, "fixturenames", ())
+    }
+
+    for item in items:
+        if getattr(item, "module", None) in fakefs_modules:
+            item.add_marker(pytest.mark.fakefs)
@@ -1,3 +1,3 @@
 from __future__ import annotations
 
-from .fixtures import python_ver, sandbox_dir
+from .fixtures import python_ver, sandbox_dir, sandbox_fs
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
+import os
 import platform
-import typing as t
 
+from pyfakefs.fake_filesystem_unittest import Patcher
 from pytest import fixture
 
-@fixture
-def sandbox_dir(fs):
-    ## Add templates directory to the fake filesystem
-    fs.add_real_directory("t", lazy_read=False)
+@fixture(scope="module")
+def sandbox_fs():
+    ## One Patcher for the whole module, the fake filesystem is patched in once instead of per test.
+    ## pyfakefs resumes a module-scoped patcher before every test in the module.
+    ## Keep tests that need the real filesystem (e.g. tmp_path) in another module.
+    ## Check the real filesystem before patching, add_real_directory fails if there is no templates dir
+    has_templates = os.path.isdir("t")
 
-    sandbox = fs.create_dir("/sandbox")
+    with Patcher() as patcher:
+        if has_templates:
+            ## Add templates directory to the fake filesystem, file contents are read on first access
+            patcher.fs.add_real_directory("t", lazy_read=True)
 
-    return sandbox
+        yield patcher.fs
 
 @fixture
+def sandbox_dir(sandbox_fs):
+    sandbox = sandbox_fs.create_dir("/sandbox")
+
+    try:
+        yield sandbox
+    finally:
+        ## Free this test's fake files instead of keeping them until the module finishes
+        sandbox_fs.remove_object("/sandbox")
+
+@fixture(scope="session")
 def python_ver() -> str:
     return platform.python_version()
\ No newline at end of file
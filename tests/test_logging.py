@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import argparse
+import logging
+
+from pingpy.main import get_console_handler, log, set_logging_format
+
+import pytest
+
+@pytest.fixture
+def cli_args():
+    """Fixture returning parsed CLI args with logging to a file disabled."""
+    args = argparse.Namespace(debug=False, verbose=False, file=None, append=False, overwrite=False)
+
+    yield args
+
+    log.removeHandler(get_console_handler())
+
+def test_set_logging_format_adds_console_handler_once(cli_args):
+    """Test that repeat calls do not attach duplicate console handlers."""
+    set_logging_format(cli_args)
+    set_logging_format(cli_args)
+
+    assert log.handlers.count(get_console_handler()) == 1
+
+def test_import_leaves_logging_flags_alone():
+    """Test that importing pingpy does not turn off thread or process info for other loggers."""
+    assert logging.logThreads
+    assert logging.logProcesses
+    assert logging.logMultiprocessing
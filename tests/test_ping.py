@@ -1,35 +1,319 @@
 from __future__ import annotations
 
-import logging
-from unittest import mock
+import asyncio
+import signal
+from types import SimpleNamespace
+from unittest.mock import create_autospec
 
-from pingpy.main import _ping_target
+from pingpy import main as pingpy_main
+from pingpy.main import _ping_target, _platform_ping_argv, _reply_rtt
 
 import pytest
 
+## Ping args the tests run with, instead of the host platform's
+WINDOWS_PING_ARGV: list[str] = ["ping", "-n", "1"]
+LINUX_PING_ARGV: list[str] = ["ping", "-c", "1"]
+
+## Specced once for the module so calls that drift from the real signature fail.
+## The mock_create_subprocess_exec fixture only resets it between tests.
+_EXEC_SPEC = create_autospec(asyncio.create_subprocess_exec)
+
+async def _stream(stdout: str):
+    """Yield `stdout` line by line as bytes, like an asyncio.StreamReader."""
+    for line in stdout.splitlines(keepends=True):
+        yield line.encode()
+
+class _FakeProcess:
+    """Stand-in for a still running asyncio subprocess that prints `stdout`."""
+
+    def __init__(self, stdout: str):
+        self.returncode = None
+        self.stdout = _stream(stdout)
+        self.killed = False
+        self.reaped = False
+
+    def kill(self):
+        self.killed = True
+
+    async def wait(self):
+        self.reaped = True
+
+        return 0
+
+def _logged(caplog, text: str) -> bool:
+    """Return True if any captured log record's message contains `text`."""
+    return any(text in record.getMessage() for record in caplog.records)
+
 @pytest.fixture
-def mock_subprocess_run():
-    """Fixture to mock subprocess.run."""
-    with mock.patch("subprocess.run") as mock_run:
-        yield mock_run
+def mock_create_subprocess_exec(monkeypatch):
+    """Fixture to replace asyncio.create_subprocess_exec with the module's autospec mock.
+
+    Set `stdout` on the returned namespace to choose what every fake ping prints. The
+    mock itself is on `.mock`, and each fake process it returned is in `.procs`.
+    """
+    _EXEC_SPEC.reset_mock()
+    fake = SimpleNamespace(stdout="Request timed out.\r\n", procs=[], mock=_EXEC_SPEC)
+
+    def spawn(*args, **kwargs):
+        fake.procs.append(_FakeProcess(fake.stdout))
+
+        return fake.procs[-1]
+
+    _EXEC_SPEC.side_effect = spawn
+    monkeypatch.setattr(pingpy_main.asyncio, "create_subprocess_exec", _EXEC_SPEC)
+
+    return fake
 
 @pytest.fixture
-def mock_platform_system():
-    """Fixture to mock platform.system."""
-    with mock.patch("platform.system") as mock_platform:
-        yield mock_platform
+def no_icmplib(monkeypatch):
+    """Fixture to simulate icmplib not being installed."""
+    monkeypatch.setattr(pingpy_main, "icmplib", None)
+
+@pytest.fixture
+def mock_icmplib(monkeypatch):
+    """Fixture to replace the optional icmplib module with a fake where every ping replies."""
+    fake = SimpleNamespace(calls=[], SocketPermissionError=PermissionError, ICMPLibError=OSError)
+
+    async def async_ping(address, **kwargs):
+        fake.calls.append(address)
+
+        return SimpleNamespace(is_alive=True, avg_rtt=2.5)
 
-def test_ping_target_success(mock_subprocess_run, mock_platform_system, caplog):
+    fake.async_ping = async_ping
+    monkeypatch.setattr(pingpy_main, "icmplib", fake)
+    ## Forget any earlier fallback to the ping command
+    monkeypatch.setattr(pingpy_main, "_icmp_sockets_allowed", True)
+
+    return fake
+
+@pytest.fixture(scope="module")
+def ping_argv():
+    """Fixture to patch the platform's ping args once for the whole module.
+
+    Tests can change the returned list in place to simulate another platform.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        argv = list(WINDOWS_PING_ARGV)
+        mp.setattr(pingpy_main, "_PING_ARGV", argv)
+
+        yield argv
+
+@pytest.fixture(autouse=True)
+def _reset_ping_argv(ping_argv):
+    """Fixture to restore the Windows ping args before each test."""
+    ping_argv[:] = WINDOWS_PING_ARGV
+
+@pytest.mark.parametrize(
+    "argv,stdout,expected_rtt",
+    [
+        (WINDOWS_PING_ARGV, "Reply from 192.168.1.1: bytes=32 time=1ms TTL=64\r\n", "1.00"),
+        (LINUX_PING_ARGV, "64 bytes from 192.168.1.1: icmp_seq=1 ttl=64 time=0.250 ms\n", "0.25"),
+    ],
+    ids=["windows", "linux"],
+)
+def test_ping_target_success(no_icmplib, mock_create_subprocess_exec, ping_argv, argv, stdout, expected_rtt, caplog):
     """Test successful ping response (mocking subprocess)."""
-    # Mock platform to return 'windows'
-    mock_platform_system.return_value = 'Windows'
+    ping_argv[:] = argv
+    # Mock the subprocess to simulate a successful ping response
+    mock_create_subprocess_exec.stdout = stdout
 
-    # Mock subprocess.run to simulate a successful ping response
-    mock_subprocess_run.return_value = mock.Mock(stdout="Reply from 192.168.1.1: bytes=32 time=1ms TTL=64", stderr="")
+    # Run the ping target function, caplog captures INFO logs (log_level in pyproject.toml)
+    _ping_target("192.168.1.1", repeat=1, verbose=True)
 
-    # Run the ping target function with caplog capturing logs at INFO level
-    with caplog.at_level(logging.INFO):
-        _ping_target("192.168.1.1", repeat=1, verbose=True)
+    # Verify the platform's ping args were used
+    mock_create_subprocess_exec.mock.assert_called_once()
+    assert mock_create_subprocess_exec.mock.call_args.args == (*argv, "192.168.1.1")
+    # Verify ping was stopped after the reply instead of waiting for its summary
+    assert mock_create_subprocess_exec.procs[0].killed
 
     # Verify that logging occurs as expected
-    assert "Reply from 192.168.1.1 - Success" in caplog.text
+    assert _logged(caplog, "Reply from 192.168.1.1 - Success")
+    assert _logged(caplog, f"Average RTT: {expected_rtt} ms")
+
+@pytest.mark.parametrize(
+    "is_windows,platform_name,expected",
+    [
+        (True, "win32", ["ping", "-n", "1", "-w", "1000"]),
+        (False, "linux", ["ping", "-c", "1", "-W", "1"]),
+        (False, "darwin", ["ping", "-c", "1", "-W", "1000"]),
+        (False, "freebsd14", ["ping", "-c", "1", "-W", "1000"]),
+        (False, "openbsd7", ["ping", "-c", "1"]),
+    ],
+    ids=["windows", "linux", "macos", "freebsd", "unknown"],
+)
+def test_platform_ping_argv(is_windows, platform_name, expected):
+    """Test that each platform gets its reply timeout in the units its ping expects."""
+    assert _platform_ping_argv(is_windows, platform_name) == expected
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        (b"Reply from 192.168.1.1: bytes=32 time=12ms TTL=64\r\n", 12.0),
+        (b"Reply from 192.168.1.1: bytes=32 time<1ms TTL=64\r\n", 0.5),
+        (b"64 bytes from 192.168.1.1: icmp_seq=1 ttl=64 time=0.250 ms\n", 0.25),
+        (b"64 bytes from time.cloudflare.com (162.159.200.1): icmp_seq=1 ttl=57 time=9.87 ms\n", 9.87),
+        (b"Request timed out.\r\n", None),
+    ],
+    ids=["windows", "windows-under-1ms", "linux", "hostname-contains-time", "no-reply"],
+)
+def test_reply_rtt(line, expected):
+    """Test that the round trip time is parsed from each platform's reply line."""
+    assert _reply_rtt(line) == expected
+
+def test_ping_target_runs_concurrently(no_icmplib, mock_create_subprocess_exec, monkeypatch, caplog):
+    """Test that pings overlap instead of each waiting for the previous reply."""
+    monkeypatch.setattr(pingpy_main, "MAX_CONCURRENT_PINGS", 5)
+    procs = mock_create_subprocess_exec.procs
+    spawn = mock_create_subprocess_exec.mock.side_effect
+
+    async def reply_once_all_started():
+        ## Only reply once all 5 ping processes exist, a sequential run would time out
+        while len(procs) < 5:
+            await asyncio.sleep(0)
+
+        yield b"Reply from 192.168.1.1: bytes=32 time=1ms TTL=64\r\n"
+
+    def spawn_blocking(*args, **kwargs):
+        proc = spawn(*args, **kwargs)
+        proc.stdout = reply_once_all_started()
+
+        return proc
+
+    mock_create_subprocess_exec.mock.side_effect = spawn_blocking
+
+    _ping_target("192.168.1.1", repeat=5, sleep_seconds=0)
+
+    assert mock_create_subprocess_exec.mock.await_count == 5
+    assert _logged(caplog, "Successes: 5, Failures: 0")
+
+def test_ping_target_caps_live_ping_tasks(no_icmplib, mock_create_subprocess_exec, monkeypatch, caplog):
+    """Test that a large count never has more than MAX_CONCURRENT_PINGS ping tasks alive."""
+    monkeypatch.setattr(pingpy_main, "MAX_CONCURRENT_PINGS", 3)
+    spawn = mock_create_subprocess_exec.mock.side_effect
+    live_tasks = []
+
+    async def slow_reply():
+        ## Stay in flight for a few loop iterations so later pings pile up behind the cap
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        yield b"Reply from 192.168.1.1: bytes=32 time=1ms TTL=64\r\n"
+
+    def spawn_counting(*args, **kwargs):
+        live_tasks.append(len(asyncio.all_tasks()))
+        proc = spawn(*args, **kwargs)
+        proc.stdout = slow_reply()
+
+        return proc
+
+    mock_create_subprocess_exec.mock.side_effect = spawn_counting
+
+    _ping_target("192.168.1.1", repeat=50, sleep_seconds=0)
+
+    ## The main task, plus at most 3 pings each waiting on its reader task
+    assert max(live_tasks) <= 1 + 3 * 2
+    assert _logged(caplog, "Successes: 50, Failures: 0")
+
+@pytest.mark.parametrize("repeat", [0, -1], ids=["zero", "negative"])
+def test_ping_target_repeat_forever_spaces_pings_evenly(no_icmplib, mock_create_subprocess_exec, monkeypatch, repeat, caplog):
+    """Test that an infinite count keeps starting pings `sleep_seconds` apart until interrupted."""
+    monkeypatch.setattr(pingpy_main, "MAX_CONCURRENT_PINGS", 2)
+    spawn = mock_create_subprocess_exec.mock.side_effect
+    started = []
+
+    async def interrupt():
+        ## Simulate CTRL+C while the seventh ping waits for its reply
+        signal.raise_signal(signal.SIGINT)
+        await asyncio.sleep(60)
+
+        yield b""
+
+    def spawn_until_interrupted(*args, **kwargs):
+        started.append(asyncio.get_running_loop().time())
+        proc = spawn(*args, **kwargs)
+        if len(started) == 7:
+            proc.stdout = interrupt()
+
+        return proc
+
+    mock_create_subprocess_exec.mock.side_effect = spawn_until_interrupted
+
+    _ping_target("192.168.1.1", repeat=repeat, sleep_seconds=0.02)
+
+    ## No gap shrinks where a MAX_CONCURRENT_PINGS sized batch would have ended
+    gaps = [later - earlier for earlier, later in zip(started, started[1:])]
+    assert min(gaps) >= 0.019
+    assert _logged(caplog, "Successes: 0, Failures: 6")
+
+def test_ping_target_interrupted_keeps_partial_counts(no_icmplib, mock_create_subprocess_exec, caplog):
+    """Test that pings finished before CTRL+C are still counted in the summary."""
+    mock_create_subprocess_exec.stdout = "Reply from 192.168.1.1: bytes=32 time=1ms TTL=64\r\n"
+    spawn = mock_create_subprocess_exec.mock.side_effect
+
+    async def interrupt():
+        ## Simulate CTRL+C while the third ping waits for its reply
+        signal.raise_signal(signal.SIGINT)
+        await asyncio.sleep(60)
+
+        yield b""
+
+    def spawn_until_interrupted(*args, **kwargs):
+        proc = spawn(*args, **kwargs)
+        if len(mock_create_subprocess_exec.procs) == 3:
+            proc.stdout = interrupt()
+
+        return proc
+
+    mock_create_subprocess_exec.mock.side_effect = spawn_until_interrupted
+
+    ## Stagger the starts so the first two pings finish before the interrupt
+    _ping_target("192.168.1.1", repeat=5, sleep_seconds=0.05)
+
+    assert _logged(caplog, "Ping interrupted by user (CTRL+C).")
+    assert _logged(caplog, "Successes: 2, Failures: 0, Average RTT: 1.00 ms")
+    ## The interrupted ping's child process is still killed and reaped
+    interrupted = mock_create_subprocess_exec.procs[2]
+    assert interrupted.killed and interrupted.reaped
+
+def test_ping_target_icmplib(mock_icmplib, mock_create_subprocess_exec, caplog):
+    """Test that icmplib is used instead of the ping command when it is installed."""
+    _ping_target("192.168.1.1", repeat=2, sleep_seconds=0)
+
+    assert len(mock_icmplib.calls) == 2
+    mock_create_subprocess_exec.mock.assert_not_called()
+    assert _logged(caplog, "Successes: 2, Failures: 0, Average RTT: 2.50 ms")
+
+def test_ping_target_icmplib_falls_back_to_ping_command(mock_icmplib, mock_create_subprocess_exec, caplog):
+    """Test that the ping command is used once unprivileged ICMP sockets are refused."""
+    mock_create_subprocess_exec.stdout = "Reply from 192.168.1.1: bytes=32 time=1ms TTL=64\r\n"
+
+    async def async_ping(address, **kwargs):
+        mock_icmplib.calls.append(address)
+
+        raise mock_icmplib.SocketPermissionError
+
+    mock_icmplib.async_ping = async_ping
+
+    _ping_target("192.168.1.1", repeat=3, sleep_seconds=0)
+
+    ## Only the first ping tries icmplib, the rest remember the fallback
+    assert len(mock_icmplib.calls) == 1
+    assert mock_create_subprocess_exec.mock.await_count == 3
+    assert _logged(caplog, "Successes: 3, Failures: 0")
+
+def test_ping_target_resolves_hostname_once(no_icmplib, mock_create_subprocess_exec, monkeypatch):
+    """Test that a hostname is resolved once and its address is pinged."""
+    lookups = []
+
+    def getaddrinfo(host, *args, **kwargs):
+        lookups.append((host, kwargs.get("family")))
+
+        return [(None, None, None, "", ("10.0.0.1", 0))]
+
+    monkeypatch.setattr(pingpy_main.socket, "getaddrinfo", getaddrinfo)
+
+    _ping_target("example.internal", repeat=3, sleep_seconds=0)
+
+    ## Only IPv4 is looked up, macOS ping cannot ping an IPv6 address
+    assert lookups == [("example.internal", pingpy_main.socket.AF_INET)]
+    assert all(call.args[-1] == "10.0.0.1" for call in mock_create_subprocess_exec.mock.call_args_list)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+
+from pyfakefs.fake_filesystem_unittest import Pause
+import pytest
+
+## sandbox_fs patches this whole module onto the fake filesystem, keep real-filesystem tests out of it
+
+@pytest.fixture
+def sandbox_removed(sandbox_fs):
+    """Fixture that checks /sandbox is gone after the test's sandbox_dir is torn down.
+
+    Request it before sandbox_dir, fixtures are torn down in reverse order so this check
+    runs after sandbox_dir's cleanup.
+    """
+    yield
+
+    assert not sandbox_fs.exists("/sandbox"), "sandbox_dir did not remove /sandbox"
+
+def test_sandbox_dir_writes_to_fake_filesystem(sandbox_fs, sandbox_dir):
+    """Test that a file written in the sandbox exists on the fake filesystem, not the real one."""
+    with open("/sandbox/scratch.txt", "w") as f:
+        f.write("scratch")
+
+    assert os.path.exists("/sandbox/scratch.txt")
+
+    with Pause(sandbox_fs):
+        assert not os.path.exists("/sandbox/scratch.txt")
+
+def test_sandbox_dir_is_removed_after_test(sandbox_removed, sandbox_dir):
+    """Test that the sandbox and the files written to it are removed when the test ends."""
+    with open("/sandbox/leftover.txt", "w") as f:
+        f.write("removed at teardown")
+
+    assert os.path.exists("/sandbox/leftover.txt")